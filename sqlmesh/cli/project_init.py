@@ -1,3 +1,4 @@
+import os
 import typing as t
 from enum import Enum
 from pathlib import Path
@@ -385,7 +386,8 @@ def init_example_project(
 def _create_folders(target_folders: t.Sequence[Path]) -> None:
     for folder_path in target_folders:
         folder_path.mkdir(exist_ok=True)
-        (folder_path / ".gitkeep").touch()
+        # Path.touch would first try to update the timestamps of an existing file
+        os.close(os.open(folder_path / ".gitkeep", os.O_CREAT | os.O_WRONLY, 0o666))
 
 
 def _create_config(
@@ -412,8 +414,7 @@ def _create_object_files(path: Path, object_dict: t.Dict[str, str], file_extensi
 
 
 def _write_file(path: Path, payload: str) -> None:
-    with open(path, "w", encoding="utf-8") as fd:
-        fd.write(payload)
+    path.write_bytes(payload.encode("utf-8"))
 
 
 def interactive_init(
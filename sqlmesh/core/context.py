@@ -698,8 +698,11 @@ class GenericContext(BaseContext, t.Generic[C]):
                         else:
                             local_store[snapshot.name] = snapshot.node  # type: ignore
 
+        all_dialects = {self.default_dialect or ""}
         for model in self._models.values():
             self.dag.add(model.fqn, model.depends_on)
+            if model.dialect:
+                all_dialects.add(model.dialect)
 
         if update_schemas:
             for fqn in self.dag:
@@ -722,8 +725,7 @@ class GenericContext(BaseContext, t.Generic[C]):
                 cache_dir=self.cache_dir,
             )
 
-            models = self.models.values()
-            for model in models:
+            for model in self._models.values():
                 # The model definition can be validated correctly only after the schema is set.
                 model.validate_definition()
 
@@ -733,9 +735,7 @@ class GenericContext(BaseContext, t.Generic[C]):
                 f"Models and Standalone audits cannot have the same name: {duplicates}"
             )
 
-        self._all_dialects = {m.dialect for m in self._models.values() if m.dialect} | {
-            self.default_dialect or ""
-        }
+        self._all_dialects = all_dialects
 
         analytics.collector.on_project_loaded(
             project_type=self._project_type,
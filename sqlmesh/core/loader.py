@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import abc
+import fnmatch
 import glob
 import itertools
 import linecache
 import os
 import re
 import typing as t
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass
-from pathlib import Path
+from functools import cached_property
+from pathlib import Path, PurePath
 from pydantic import ValidationError
 import concurrent.futures
 
@@ -37,6 +39,7 @@ from sqlmesh.core.model.common import make_python_env
 from sqlmesh.core.signal import signal
 from sqlmesh.core.test import ModelTestMetadata
 from sqlmesh.utils import UniqueKeyDict, sys_path
+from sqlmesh.utils.concurrency import concurrent_apply_to_values
 from sqlmesh.utils.errors import ConfigError
 from sqlmesh.utils.jinja import JinjaMacroRegistry, MacroExtractor
 from sqlmesh.utils.metaprogramming import import_python_file
@@ -51,6 +54,34 @@ if t.TYPE_CHECKING:
 
 GATEWAY_PATTERN = re.compile(r"gateway:\s*([^\s]+)")
 
+MAX_READ_WORKERS = 16
+
+IgnorePattern = t.Tuple[bool, t.List[t.Pattern[str]]]
+
+
+def _compile_ignore_pattern(pattern: str) -> IgnorePattern:
+    """Compiles a glob pattern into one regex per path component, mirroring `PurePath.match`.
+
+    Returns:
+        A tuple of whether the pattern is absolute and the compiled components.
+    """
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    pure_pattern = PurePath(pattern)
+    return pure_pattern.is_absolute(), [
+        re.compile(fnmatch.translate(part), flags) for part in pure_pattern.parts
+    ]
+
+
+def _match_ignore_pattern(parts: t.Sequence[str], ignore_pattern: IgnorePattern) -> bool:
+    """Matches path components against a compiled ignore pattern from the right."""
+    is_absolute, pattern_parts = ignore_pattern
+    if len(parts) < len(pattern_parts) or (is_absolute and len(parts) != len(pattern_parts)):
+        return False
+    return all(
+        pattern_part.match(part)
+        for pattern_part, part in zip(reversed(pattern_parts), reversed(parts))
+    )
+
 
 @dataclass
 class LoadedProject:
@@ -132,8 +163,7 @@ def load_sql_models(path: Path) -> t.List[Model]:
     assert _defaults
     assert _cache
 
-    with open(path, "r", encoding="utf-8") as file:
-        expressions = parse(file.read(), default_dialect=_defaults["dialect"])
+    expressions = parse(path.read_text(encoding="utf-8"), default_dialect=_defaults["dialect"])
     models = load_sql_based_models(expressions, path=Path(path).absolute(), **_defaults)
 
     return [] if _cache.put(models, path) else models
@@ -175,6 +205,9 @@ class Loader(abc.ABC):
         from sqlmesh.core.console import get_console
 
         self._path_mtimes: t.Dict[Path, float] = {}
+        self._ignore_patterns_cache: t.Dict[
+            t.Tuple[str, ...], t.Tuple[t.Set[str], t.List[IgnorePattern]]
+        ] = {}
         self.context = context
         self.config_path = path
         self.config = self.context.configs[self.config_path]
@@ -200,21 +233,20 @@ class Loader(abc.ABC):
             # need to manually clear here so we can reload macros
             linecache.clearcache()
             self._path_mtimes.clear()
+            self._ignore_patterns_cache.clear()
 
             self._load_materializations()
             signals = self._load_signals()
 
-            config_mtimes: t.Dict[Path, t.List[float]] = defaultdict(list)
+            self._config_mtimes: t.Dict[Path, float] = {}
 
-            for config_file in self.config_path.glob("config.*"):
-                self._track_file(config_file)
-                config_mtimes[self.config_path].append(self._path_mtimes[config_file])
-
-            for config_file in c.SQLMESH_PATH.glob("config.*"):
-                self._track_file(config_file)
-                config_mtimes[c.SQLMESH_PATH].append(self._path_mtimes[config_file])
-
-            self._config_mtimes = {path: max(mtimes) for path, mtimes in config_mtimes.items()}
+            for config_dir in (self.config_path, c.SQLMESH_PATH):
+                for config_file in config_dir.glob("config.*"):
+                    self._track_file(config_file)
+                    mtime = self._path_mtimes[config_file]
+                    self._config_mtimes[config_dir] = max(
+                        self._config_mtimes.get(config_dir, mtime), mtime
+                    )
 
             macros, jinja_macros = self._load_scripts()
             audits: UniqueKeyDict[str, ModelAudit] = UniqueKeyDict("audits")
@@ -269,8 +301,16 @@ class Loader(abc.ABC):
         Returns:
             True if a modification is found; False otherwise
         """
+
+        def _modified(path: Path, initial_mtime: float) -> bool:
+            # A single stat call per file, rather than one for exists() and another for stat()
+            try:
+                return os.stat(path).st_mtime > initial_mtime
+            except OSError:
+                return True
+
         return any(
-            not path.exists() or path.stat().st_mtime > initial_mtime
+            _modified(path, initial_mtime)
             for path, initial_mtime in self._path_mtimes.copy().items()
         )
 
@@ -331,27 +371,30 @@ class Loader(abc.ABC):
         if external_models_path.exists() and external_models_path.is_dir():
             paths_to_load.extend(self._glob_paths(external_models_path, extension=".yaml"))
 
+        yaml = YAML()
+        defaults = self.config.model_defaults.dict()
+        dialect = self.config.model_defaults.dialect
+
         def _load(path: Path) -> t.List[Model]:
             try:
-                with open(path, "r", encoding="utf-8") as file:
-                    yaml = YAML().load(file)
-                    # Allow empty YAML files to return an empty list
-                    if yaml is None:
-                        return []
-                    return [
-                        create_external_model(
-                            defaults=self.config.model_defaults.dict(),
-                            path=path,
-                            project=self.config.project,
-                            audit_definitions=audits,
-                            **{
-                                "dialect": self.config.model_defaults.dialect,
-                                "default_catalog": self.context.default_catalog,
-                                **row,
-                            },
-                        )
-                        for row in yaml
-                    ]
+                rows = yaml.load(path.read_text(encoding="utf-8"))
+                # Allow empty YAML files to return an empty list
+                if rows is None:
+                    return []
+                return [
+                    create_external_model(
+                        defaults=defaults,
+                        path=path,
+                        project=self.config.project,
+                        audit_definitions=audits,
+                        **{
+                            "dialect": dialect,
+                            "default_catalog": self.context.default_catalog,
+                            **row,
+                        },
+                    )
+                    for row in rows
+                ]
             except Exception as ex:
                 raise ConfigError(self._failed_to_load_model_error(path, ex), path)
 
@@ -449,25 +492,106 @@ class Loader(abc.ABC):
         Returns:
             Matched paths that are not ignored
         """
-        ignore_patterns = ignore_patterns or []
-        extension = extension or ""
-
-        # We try to match both ignore_pattern itself and every file returned by glob,
-        # so that we will always ignore file names that do not appear in the latter.
-        ignored_filepaths = set(ignore_patterns) | {
-            ignored_path
-            for ignore_pattern in ignore_patterns
-            for ignored_path in glob.glob(str(self.config_path / ignore_pattern), recursive=True)
-        }
-        for filepath in path.glob(f"**/*{extension}"):
-            if any(filepath.match(ignored_filepath) for ignored_filepath in ignored_filepaths):
+        # Most projects only use a subset of the project directories, so we bail out before
+        # expanding the ignore patterns or scanning anything if this one doesn't exist
+        if not os.path.isdir(path):
+            return
+
+        # File names are compared case-insensitively on Windows, like Path.glob does there
+        extension = os.path.normcase(extension or "")
+        ignored_filepaths, compiled_patterns = self._compile_ignore_patterns(ignore_patterns or [])
+
+        # Walk the tree with os.scandir instead of Path.glob("**/*"), which is considerably slower.
+        # The order matters, since later jinja macros overwrite earlier ones, so entries are sorted
+        # by name: a directory's files are yielded before the files of its subdirectories, which
+        # are then walked depth-first. Symlinked directories are not followed.
+        # Each directory is paired with its path components, so that ignore patterns can be matched
+        # against a file's components without creating a Path for every file that is visited
+        stack = [(str(path), Path(path).parts)]
+        while stack:
+            dirpath, dir_parts = stack.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
                 continue
 
-            yield filepath
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, (*dir_parts, entry.name)))
+                        continue
+                    if not os.path.normcase(entry.name).endswith(extension) or not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                if compiled_patterns:
+                    parts = (*dir_parts, entry.name)
+                    if any(_match_ignore_pattern(parts, pattern) for pattern in compiled_patterns):
+                        continue
+                if ignored_filepaths and os.path.normcase(entry.path) in ignored_filepaths:
+                    continue
+
+                yield Path(entry.path)
+
+            stack.extend(reversed(subdirs))
+
+    def _compile_ignore_patterns(
+        self, ignore_patterns: t.List[str]
+    ) -> t.Tuple[t.Set[str], t.List[IgnorePattern]]:
+        """
+        Expands and compiles the ignore patterns once per load, rather than once per globbed file.
+
+        Args:
+            ignore_patterns: A list of glob patterns to ignore
+
+        Returns:
+            A tuple of the files matched by the patterns and the compiled patterns
+        """
+        key = tuple(ignore_patterns)
+        if key not in self._ignore_patterns_cache:
+            # We try to match both ignore_pattern itself and every file returned by glob,
+            # so that we will always ignore file names that do not appear in the latter.
+            ignored_filepaths = {
+                os.path.normcase(ignored_path)
+                for ignore_pattern in ignore_patterns
+                for ignored_path in glob.glob(
+                    str(self.config_path / ignore_pattern), recursive=True
+                )
+            }
+            self._ignore_patterns_cache[key] = (
+                ignored_filepaths,
+                [_compile_ignore_pattern(pattern) for pattern in ignore_patterns if pattern],
+            )
+        return self._ignore_patterns_cache[key]
+
+    def _read_files(self, paths: t.Sequence[Path]) -> t.List[str]:
+        """
+        Reads the files concurrently, so that the parsing that follows doesn't wait on each read,
+        which matters on slow and networked filesystems.
+
+        Args:
+            paths: The paths of the files to read
+
+        Returns:
+            The contents of the files, in the same order as the paths
+        """
+        return concurrent_apply_to_values(
+            paths,
+            lambda path: path.read_text(encoding="utf-8"),
+            tasks_num=max(1, min(len(paths), MAX_READ_WORKERS)),
+        )
 
-    def _track_file(self, path: Path) -> None:
-        """Project file to track for modifications"""
-        self._path_mtimes[path] = path.stat().st_mtime
+    def _track_file(self, path: Path, stat_result: t.Optional[os.stat_result] = None) -> None:
+        """Project file to track for modifications
+
+        Args:
+            path: The path of the file to track
+            stat_result: The result of an earlier stat call for the path, to avoid repeating it
+        """
+        self._path_mtimes[path] = (stat_result or path.stat()).st_mtime
 
     def _failed_to_load_model_error(self, path: Path, error: t.Union[str, Exception]) -> str:
         base_message = f"Failed to load model from file '{path}':"
@@ -489,6 +613,7 @@ class SqlMeshLoader(Loader):
         extractor = MacroExtractor()
 
         macros_max_mtime: t.Optional[float] = None
+        dialect = self.config.model_defaults.dialect
 
         for path in self._glob_paths(
             self.config_path / c.MACROS,
@@ -504,20 +629,24 @@ class SqlMeshLoader(Loader):
                     else macro_file_mtime
                 )
 
-        for path in self._glob_paths(
-            self.config_path / c.MACROS,
-            ignore_patterns=self.config.ignore_patterns,
-            extension=".sql",
-        ):
+        paths = list(
+            self._glob_paths(
+                self.config_path / c.MACROS,
+                ignore_patterns=self.config.ignore_patterns,
+                extension=".sql",
+            )
+        )
+        # Track the files before reading them, so that an edit made in between is picked up
+        # on the next reload instead of being recorded against the old contents
+        for path in paths:
             self._track_file(path)
             macro_file_mtime = self._path_mtimes[path]
             macros_max_mtime = (
                 max(macros_max_mtime, macro_file_mtime) if macros_max_mtime else macro_file_mtime
             )
-            with open(path, "r", encoding="utf-8") as file:
-                jinja_macros.add_macros(
-                    extractor.extract(file.read(), dialect=self.config.model_defaults.dialect)
-                )
+
+        for source in self._read_files(paths):
+            jinja_macros.add_macros(extractor.extract(source, dialect=dialect))
 
         self._macros_max_mtime = macros_max_mtime
 
@@ -570,10 +699,11 @@ class SqlMeshLoader(Loader):
             ignore_patterns=self.config.ignore_patterns,
             extension=".sql",
         ):
-            if not os.path.getsize(path):
+            stat_result = path.stat()
+            if not stat_result.st_size:
                 continue
 
-            self._track_file(path)
+            self._track_file(path, stat_result)
             paths.add(path)
             if cached_models := cache.get(path):
                 cached_paths[path] = cached_models
@@ -612,7 +742,13 @@ class SqlMeshLoader(Loader):
                     cache,
                     self._console,
                 ),
-                max_workers=c.MAX_FORK_WORKERS,
+                # Forked pools start all of their workers upfront, so we don't fork more processes
+                # than there are files left to load, e.g. when only a few models have changed. The
+                # pool must still fork at least two workers unless forking is disabled, since a
+                # single worker would run the initializer, and its global side effects, in-process
+                max_workers=1
+                if c.MAX_FORK_WORKERS == 1
+                else max(2, min(len(paths), c.MAX_FORK_WORKERS or os.cpu_count() or 1)),
             ) as pool:
                 futures_to_paths = {pool.submit(load_sql_models, path): path for path in paths}
                 for future in concurrent.futures.as_completed(futures_to_paths):
@@ -647,18 +783,21 @@ class SqlMeshLoader(Loader):
         registry = model_registry.registry()
         registry.clear()
         registered: t.Set[str] = set()
+        defaults = self.config.model_defaults.dict()
+        dialect = self.config.model_defaults.dialect
 
-        model_registry._dialect = self.config.model_defaults.dialect
+        model_registry._dialect = dialect
         try:
             for path in self._glob_paths(
                 self.config_path / c.MODELS,
                 ignore_patterns=self.config.ignore_patterns,
                 extension=".py",
             ):
-                if not os.path.getsize(path):
+                stat_result = path.stat()
+                if not stat_result.st_size:
                     continue
 
-                self._track_file(path)
+                self._track_file(path, stat_result)
                 try:
                     import_python_file(path, self.config_path)
                     new = registry.keys() - registered
@@ -668,10 +807,10 @@ class SqlMeshLoader(Loader):
                             get_variables,
                             path=path,
                             module_path=self.config_path,
-                            defaults=self.config.model_defaults.dict(),
+                            defaults=defaults,
                             macros=macros,
                             jinja_macros=jinja_macros,
-                            dialect=self.config.model_defaults.dialect,
+                            dialect=dialect,
                             time_column_format=self.config.time_column_format,
                             physical_schema_mapping=self.config.physical_schema_mapping,
                             project=self.config.project,
@@ -694,6 +833,7 @@ class SqlMeshLoader(Loader):
 
     def load_materializations(self) -> None:
         with sys_path(self.config_path):
+            self._ignore_patterns_cache.clear()
             self._load_materializations()
 
     def _load_materializations(self) -> None:
@@ -717,9 +857,10 @@ class SqlMeshLoader(Loader):
             ignore_patterns=self.config.ignore_patterns,
             extension=".py",
         ):
-            if os.path.getsize(path):
-                self._track_file(path)
-                signal_file_mtime = self._path_mtimes[path]
+            stat_result = path.stat()
+            if stat_result.st_size:
+                self._track_file(path, stat_result)
+                signal_file_mtime = stat_result.st_mtime
                 signals_max_mtime = (
                     max(signals_max_mtime, signal_file_mtime)
                     if signals_max_mtime
@@ -741,34 +882,37 @@ class SqlMeshLoader(Loader):
         audits_by_name: UniqueKeyDict[str, Audit] = UniqueKeyDict("audits")
         audits_max_mtime: t.Optional[float] = None
         variables = get_variables()
+        dialect = self.config.model_defaults.dialect
 
-        for path in self._glob_paths(
-            self.config_path / c.AUDITS,
-            ignore_patterns=self.config.ignore_patterns,
-            extension=".sql",
-        ):
+        paths = list(
+            self._glob_paths(
+                self.config_path / c.AUDITS,
+                ignore_patterns=self.config.ignore_patterns,
+                extension=".sql",
+            )
+        )
+        for path in paths:
             self._track_file(path)
-            with open(path, "r", encoding="utf-8") as file:
-                audits_file_mtime = self._path_mtimes[path]
-                audits_max_mtime = (
-                    max(audits_max_mtime, audits_file_mtime)
-                    if audits_max_mtime
-                    else audits_file_mtime
-                )
-                expressions = parse(file.read(), default_dialect=self.config.model_defaults.dialect)
-                audits = load_multiple_audits(
-                    expressions=expressions,
-                    path=path,
-                    module_path=self.config_path,
-                    macros=macros,
-                    jinja_macros=jinja_macros,
-                    dialect=self.config.model_defaults.dialect,
-                    default_catalog=self.context.default_catalog,
-                    variables=variables,
-                    project=self.config.project,
-                )
-                for audit in audits:
-                    audits_by_name[audit.name] = audit
+            audits_file_mtime = self._path_mtimes[path]
+            audits_max_mtime = (
+                max(audits_max_mtime, audits_file_mtime) if audits_max_mtime else audits_file_mtime
+            )
+
+        for path, source in zip(paths, self._read_files(paths)):
+            expressions = parse(source, default_dialect=dialect)
+            audits = load_multiple_audits(
+                expressions=expressions,
+                path=path,
+                module_path=self.config_path,
+                macros=macros,
+                jinja_macros=jinja_macros,
+                dialect=dialect,
+                default_catalog=self.context.default_catalog,
+                variables=variables,
+                project=self.config.project,
+            )
+            for audit in audits:
+                audits_by_name[audit.name] = audit
 
         self._audits_max_mtime = audits_max_mtime
 
@@ -777,26 +921,27 @@ class SqlMeshLoader(Loader):
     def _load_metrics(self) -> UniqueKeyDict[str, MetricMeta]:
         """Loads all metrics."""
         metrics: UniqueKeyDict[str, MetricMeta] = UniqueKeyDict("metrics")
+        dialect = self.config.model_defaults.dialect
 
+        paths = []
         for path in self._glob_paths(
             self.config_path / c.METRICS,
             ignore_patterns=self.config.ignore_patterns,
             extension=".sql",
         ):
-            if not os.path.getsize(path):
+            stat_result = path.stat()
+            if not stat_result.st_size:
                 continue
-            self._track_file(path)
+            self._track_file(path, stat_result)
+            paths.append(path)
 
-            with open(path, "r", encoding="utf-8") as file:
-                dialect = self.config.model_defaults.dialect
-                try:
-                    for expression in parse(file.read(), default_dialect=dialect):
-                        metric = load_metric_ddl(expression, path=path, dialect=dialect)
-                        metrics[metric.name] = metric
-                except SqlglotError as ex:
-                    raise ConfigError(
-                        f"Failed to parse metric definitions at '{path}': {ex}.", path
-                    )
+        for path, source in zip(paths, self._read_files(paths)):
+            try:
+                for expression in parse(source, default_dialect=dialect):
+                    metric = load_metric_ddl(expression, path=path, dialect=dialect)
+                    metrics[metric.name] = metric
+            except SqlglotError as ex:
+                raise ConfigError(f"Failed to parse metric definitions at '{path}': {ex}.", path)
 
         return metrics
 
@@ -837,8 +982,9 @@ class SqlMeshLoader(Loader):
             ignore_patterns=self.config.ignore_patterns,
             extension=".py",
         ):
-            if os.path.getsize(path):
-                self._track_file(path)
+            stat_result = path.stat()
+            if stat_result.st_size:
+                self._track_file(path, stat_result)
                 module = import_python_file(path, self.config_path)
                 module_rules = subclasses(module.__name__, Rule, exclude={Rule})
                 for user_rule in module_rules:
@@ -850,12 +996,11 @@ class SqlMeshLoader(Loader):
         """Load a single model test file."""
         model_test_metadata = {}
 
-        with open(path, "r", encoding="utf-8") as file:
-            source = file.read()
-            # If the user has specified a quoted/escaped gateway (e.g. "gateway: 'ma\tin'"), we need to
-            # parse it as YAML to match the gateway name stored in the config
-            gateway_line = GATEWAY_PATTERN.search(source)
-            gateway = YAML().load(gateway_line.group(0))["gateway"] if gateway_line else None
+        source = path.read_text(encoding="utf-8")
+        # If the user has specified a quoted/escaped gateway (e.g. "gateway: 'ma\tin'"), we need to
+        # parse it as YAML to match the gateway name stored in the config
+        gateway_line = GATEWAY_PATTERN.search(source)
+        gateway = YAML().load(gateway_line.group(0))["gateway"] if gateway_line else None
 
         contents = yaml_load(source, variables=get_variables(gateway))
 
@@ -873,16 +1018,16 @@ class SqlMeshLoader(Loader):
         search_path = Path(self.config_path) / c.TESTS
 
         for yaml_file in itertools.chain(
-            search_path.glob("**/test*.yaml"),
-            search_path.glob("**/test*.yml"),
+            self._glob_paths(
+                search_path, ignore_patterns=self.config.ignore_patterns, extension=".yaml"
+            ),
+            self._glob_paths(
+                search_path, ignore_patterns=self.config.ignore_patterns, extension=".yml"
+            ),
         ):
-            if any(
-                yaml_file.match(ignore_pattern)
-                for ignore_pattern in self.config.ignore_patterns or []
-            ):
-                continue
-
-            test_meta_list.extend(self._load_model_test_file(yaml_file).values())
+            # Path.glob("test*") would also match e.g. Test_model.yaml on Windows
+            if os.path.normcase(yaml_file.name).startswith("test"):
+                test_meta_list.extend(self._load_model_test_file(yaml_file).values())
 
         return test_meta_list
 
@@ -925,22 +1070,25 @@ class SqlMeshLoader(Loader):
             return models
 
         def _cache_entry_name(self, target_path: Path) -> str:
-            return "__".join(target_path.relative_to(self.config_path).parts).replace(
-                target_path.suffix, ""
-            )
+            return "__".join(target_path.relative_to(self.config_path).with_suffix("").parts)
 
-        def _model_cache_entry_id(self, model_path: Path) -> str:
+        @cached_property
+        def _max_mtime(self) -> t.Optional[float]:
+            # Scripts, signals and audits are loaded before the models, so only the
+            # model file's own mtime varies between cache entries
             mtimes = [
-                self._loader._path_mtimes[model_path],
                 self._loader._macros_max_mtime,
                 self._loader._signals_max_mtime,
                 self._loader._audits_max_mtime,
                 self._loader._config_mtimes.get(self.config_path),
                 self._loader._config_mtimes.get(c.SQLMESH_PATH),
             ]
+            return max((m for m in mtimes if m is not None), default=None)
+
+        @cached_property
+        def _cache_entry_id_suffix(self) -> str:
             return "__".join(
                 [
-                    str(max(m for m in mtimes if m is not None)),
                     self._loader.config.fingerprint,
                     # default catalog can change outside sqlmesh (e.g., DB user's
                     # default catalog), and it is retained in cached model's fully
@@ -952,3 +1100,9 @@ class SqlMeshLoader(Loader):
                     self._loader.context.gateway or self._loader.config.default_gateway_name,
                 ]
             )
+
+        def _model_cache_entry_id(self, model_path: Path) -> str:
+            mtime = self._loader._path_mtimes[model_path]
+            if self._max_mtime is not None:
+                mtime = max(mtime, self._max_mtime)
+            return f"{mtime}__{self._cache_entry_id_suffix}"
@@ -2975,8 +2975,9 @@ def render_model_defaults(
     variables: t.Optional[t.Dict[str, t.Any]],
     default_catalog: t.Optional[str],
 ) -> t.Dict[str, t.Any]:
+    # render_meta_fields updates the fields in place, but the defaults are shared across models
     rendered_defaults = render_meta_fields(
-        fields=defaults,
+        fields=dict(defaults),
         module_path=module_path,
         macros=macros,
         jinja_macros=jinja_macros,
@@ -434,7 +434,7 @@ class DbtLoader(Loader):
                 )
             except ValueError:
                 path_for_name = target_path
-            name = "__".join(path_for_name.parts).replace(path_for_name.suffix, "")
+            name = "__".join(path_for_name.with_suffix("").parts)
             if len(name) > self.MAX_ENTRY_NAME_LENGTH:
                 return name[len(name) - self.MAX_ENTRY_NAME_LENGTH :]
             return name
@@ -14,6 +14,7 @@ from jinja2 import Environment, Template, nodes, UndefinedError
 from jinja2.runtime import Macro
 from sqlglot import Dialect, Parser, TokenType
 from sqlglot.expressions import Expression
+from sqlglot.tokens import Tokenizer
 
 from sqlmesh.core import constants as c
 from sqlmesh.core import dialect as d
@@ -66,6 +67,11 @@ class MacroReturnVal(Exception):
 
 
 class MacroExtractor(Parser):
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Reused across extract calls, so that a dialect and tokenizer aren't created per file
+        self._tokenizers: t.Dict[str, Tokenizer] = {}
+
     def extract(self, jinja: str, dialect: str = "") -> t.Dict[str, MacroInfo]:
         """Extract a dictionary of macro definitions from a jinja string.
 
@@ -78,7 +84,15 @@ class MacroExtractor(Parser):
         """
         self.reset()
         self.sql = jinja
-        self._tokens = Dialect.get_or_raise(dialect).tokenize(jinja)
+
+        # Macros can only be defined inside of blocks, so there's no need to tokenize otherwise
+        if "{%" not in jinja:
+            return {}
+
+        tokenizer = self._tokenizers.get(dialect)
+        if tokenizer is None:
+            tokenizer = self._tokenizers[dialect] = Dialect.get_or_raise(dialect).tokenizer()
+        self._tokens = tokenizer.tokenize(jinja)
 
         # guard for older sqlglot versions (before 30.0.3)
         if hasattr(self, "_tokens_size"):
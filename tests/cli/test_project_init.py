@@ -31,3 +31,16 @@ def test_project_init_dbt(tmp_path: Path):
     ctx = Context(paths=tmp_path)
     assert ctx.config.model_defaults.start
     assert ctx.config.virtual_environment_mode == VirtualEnvironmentMode.DEV_ONLY
+
+
+def test_project_init_default(tmp_path: Path):
+    init_example_project(path=tmp_path, engine_type="duckdb")
+
+    for folder in ("audits", "macros", "models", "seeds", "tests"):
+        assert (tmp_path / folder / ".gitkeep").read_bytes() == b""
+
+    full_model = (tmp_path / "models" / "full_model.sql").read_bytes()
+    assert full_model.startswith(b"MODEL (")
+
+    ctx = Context(paths=tmp_path)
+    assert len(ctx.models) == 3
@@ -129,6 +129,16 @@ def test_dag(sushi_context):
     }
 
 
+def test_all_dialects(tmp_path: Path):
+    init_example_project(tmp_path, engine_type="duckdb")
+    (tmp_path / "models" / "snowflake_model.sql").write_text(
+        "MODEL (name sqlmesh_example.snowflake_model, dialect snowflake); SELECT 1 AS c"
+    )
+
+    context = Context(paths=tmp_path)
+    assert context._all_dialects == {"duckdb", "snowflake"}
+
+
 @pytest.mark.slow
 def test_render_sql_model(sushi_context, assert_exp_eq, copy_to_temp_path: t.Callable):
     assert_exp_eq(
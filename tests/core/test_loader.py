@@ -1,8 +1,11 @@
+import os
+import typing as t
 import pytest
 from pathlib import Path
 from sqlmesh.cli.project_init import init_example_project
 from sqlmesh.core.config import Config, ModelDefaultsConfig
 from sqlmesh.core.context import Context
+from sqlmesh.core.loader import SqlMeshLoader
 from sqlmesh.utils.errors import ConfigError
 
 
@@ -201,3 +204,166 @@ def my_model(context, **kwargs):
     assert model.description == "model_payload_a"
     path_b.write_text(model_payload_b)
     context.load()  # raise no error to duplicate key if the functions are identical (by registry class_method)
+
+
+def test_glob_paths(tmp_path: Path) -> None:
+    """Test that _glob_paths walks subdirectories in name order and honours the ignore patterns."""
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config, load=False)
+    loader = context._loaders[0]
+
+    models_dir = tmp_path / "models"
+    for relative_path in (
+        "a/b/nested.sql",
+        "a/model.sql",
+        "a/c/z.sql",
+        "0/zero.sql",
+        "a/not_a_model.txt",
+        "ignore/ignored.sql",
+        ".ipynb_checkpoints/checkpoint.sql",
+    ):
+        file_path = models_dir / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(f"MODEL (name db.{file_path.stem}); SELECT 1 AS c")
+
+    (models_dir / "a" / "dir.sql").mkdir()
+
+    paths = list(
+        loader._glob_paths(
+            models_dir,
+            ignore_patterns=["models/ignore/**/*.sql", ".ipynb_checkpoints/*"],
+            extension=".sql",
+        )
+    )
+
+    # Files are sorted by name and yielded before the files in subdirectories, which are walked
+    # depth-first
+    assert [p.relative_to(models_dir).as_posix() for p in paths] == [
+        "full_model.sql",
+        "incremental_model.sql",
+        "seed_model.sql",
+        "0/zero.sql",
+        "a/model.sql",
+        "a/b/nested.sql",
+        "a/c/z.sql",
+    ]
+    assert list(loader._glob_paths(tmp_path / "missing", extension=".sql")) == []
+    assert list(loader._glob_paths(models_dir / "a" / "model.sql", extension=".sql")) == []
+
+    # The ignore patterns are expanded and compiled once per load, and only for existing directories
+    assert list(loader._ignore_patterns_cache) == [
+        ("models/ignore/**/*.sql", ".ipynb_checkpoints/*")
+    ]
+    context.load()
+    assert list(loader._ignore_patterns_cache) == [tuple(config.ignore_patterns)]
+
+
+def test_glob_paths_normcase(tmp_path: Path, mocker) -> None:
+    """Test that _glob_paths compares file extensions case-insensitively where the platform does."""
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config, load=False)
+    loader = context._loaders[0]
+
+    models_dir = tmp_path / "models"
+    for relative_path in ("upper/MODEL.SQL", "upper/mixed.Sql"):
+        file_path = models_dir / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("MODEL (name db.upper); SELECT 1 AS c")
+
+    def upper_names() -> t.Set[str]:
+        return {p.name for p in loader._glob_paths(models_dir / "upper", extension=".sql")}
+
+    assert upper_names() == set()
+
+    # Emulate Windows, where os.path.normcase lowercases paths
+    mocker.patch("os.path.normcase", lambda p: os.fspath(p).lower())
+    assert upper_names() == {"MODEL.SQL", "mixed.Sql"}
+
+
+def test_load_model_tests_normcase(tmp_path: Path, mocker) -> None:
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config, load=False)
+    loader = context._loaders[0]
+
+    tests_dir = tmp_path / "tests"
+    (tests_dir / "Test_upper.YAML").write_text(
+        (tests_dir / "test_full_model.yaml")
+        .read_text()
+        .replace("test_example_full_model", "test_upper_full_model")
+    )
+
+    def test_names() -> t.Set[str]:
+        return {metadata.test_name for metadata in loader.load_model_tests()}
+
+    assert test_names() == {"test_example_full_model"}
+
+    # Emulate Windows, where os.path.normcase lowercases paths
+    mocker.patch("os.path.normcase", lambda p: os.fspath(p).lower())
+    assert test_names() == {"test_example_full_model", "test_upper_full_model"}
+
+
+def test_reload_needed(tmp_path: Path) -> None:
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config)
+    loader = context._loaders[0]
+
+    assert not loader.reload_needed()
+
+    model_path = tmp_path / "models" / "full_model.sql"
+    mtime = model_path.stat().st_mtime + 10
+    os.utime(model_path, (mtime, mtime))
+    assert loader.reload_needed()
+
+    context.load()
+    assert not loader.reload_needed()
+
+    model_path.unlink()
+    assert loader.reload_needed()
+
+
+def test_cache_entry_name(tmp_path: Path) -> None:
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config, load=False)
+    loader = context._loaders[0]
+    assert isinstance(loader, SqlMeshLoader)
+    cache = SqlMeshLoader._Cache(loader, tmp_path)
+
+    assert cache._cache_entry_name(tmp_path / "models" / "orders.sql") == "models__orders"
+    # Only the suffix of the file itself is stripped
+    assert (
+        cache._cache_entry_name(tmp_path / "models" / "v1.sql_models" / "orders.sql")
+        == "models__v1.sql_models__orders"
+    )
+
+
+def test_model_cache_entry_id(tmp_path: Path) -> None:
+    init_example_project(tmp_path, engine_type="duckdb")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+    context = Context(paths=tmp_path, config=config)
+    loader = context._loaders[0]
+    assert isinstance(loader, SqlMeshLoader)
+    cache = SqlMeshLoader._Cache(loader, tmp_path)
+
+    model_path = tmp_path / "models" / "full_model.sql"
+    suffix = f"{config.fingerprint}__{context.default_catalog}__{config.default_gateway_name}"
+    base_mtime = max(
+        m
+        for m in (
+            loader._macros_max_mtime,
+            loader._signals_max_mtime,
+            loader._audits_max_mtime,
+            loader._config_mtimes[tmp_path],
+        )
+        if m is not None
+    )
+
+    loader._path_mtimes[model_path] = base_mtime - 10
+    assert cache._model_cache_entry_id(model_path) == f"{base_mtime}__{suffix}"
+
+    loader._path_mtimes[model_path] = base_mtime + 10
+    assert cache._model_cache_entry_id(model_path) == f"{base_mtime + 10}__{suffix}"
@@ -4826,6 +4826,10 @@ def test_model_defaults_macros_python_model(make_snapshot):
         variables={"gateway": "local", "create_type": "SECURE", "cron_macro_expr": "0 */2 * * *"},
     )
 
+    # The defaults are shared across all models of a project, so rendering must not mutate them
+    assert model_defaults["cron"] == "@cron_macro_expr"
+    assert model_defaults["enabled"] == "@IF(@gateway = 'local', True, False)"
+
     # Even if in the project wide defaults this is ignored for python models
     assert not m.optimize_query
 
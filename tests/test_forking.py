@@ -1,8 +1,13 @@
 import os
 import pytest
+from pathlib import Path
 
 from sqlmesh import Context
+from sqlmesh.cli.project_init import init_example_project
+from sqlmesh.core import loader
+from sqlmesh.core.config import Config, ModelDefaultsConfig
 from sqlmesh.core.model import schema
+from sqlmesh.utils.process import SynchronousPoolExecutor
 import concurrent.futures
 
 
@@ -86,3 +91,50 @@ def test_parallel_load_multi_repo(assert_exp_eq, mocker):
     )
 
     context.plan(no_prompts=True, auto_apply=True)
+
+
+def test_parallel_load_pool_size(tmp_path: Path, mocker):
+    mocker.patch("sqlmesh.core.constants.MAX_FORK_WORKERS", 4)
+    init_example_project(tmp_path, engine_type="duckdb")
+
+    create_pool = mocker.spy(loader, "create_process_pool_executor")
+    context = Context(paths=tmp_path)
+    assert create_pool.call_args[1]["max_workers"] == 3
+
+    # Only the modified model and the seed model, which is never cached, need to be loaded again
+    model_path = tmp_path / "models" / "full_model.sql"
+    model_path.write_text(model_path.read_text() + "\n")
+    mtime = model_path.stat().st_mtime + 10
+    os.utime(model_path, (mtime, mtime))
+
+    create_pool.reset_mock()
+    context.load()
+    assert create_pool.call_args[1]["max_workers"] == 2
+    assert len(context.models) == 3
+
+
+def test_parallel_load_pool_size_single_file(tmp_path: Path, mocker):
+    mocker.patch("sqlmesh.core.constants.MAX_FORK_WORKERS", 4)
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "a.sql").write_text("MODEL (name test.a); SELECT 1 AS col")
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+
+    # A single file is still loaded in a forked worker, so that the pool initializer doesn't
+    # overwrite the globals of the parent process
+    create_pool = mocker.spy(loader, "create_process_pool_executor")
+    context = Context(paths=tmp_path, config=config)
+    assert create_pool.call_args[1]["max_workers"] == 2
+    if hasattr(os, "fork"):
+        assert isinstance(create_pool.spy_return, concurrent.futures.ProcessPoolExecutor)
+    assert len(context.models) == 1
+
+    model_path = tmp_path / "models" / "a.sql"
+    mtime = model_path.stat().st_mtime + 10
+    os.utime(model_path, (mtime, mtime))
+
+    mocker.patch("sqlmesh.core.constants.MAX_FORK_WORKERS", 1)
+    create_pool.reset_mock()
+    context.load()
+    assert create_pool.call_args[1]["max_workers"] == 1
+    assert isinstance(create_pool.spy_return, SynchronousPoolExecutor)
+    assert len(context.models) == 1
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.tokens import Tokenizer
+
 from sqlmesh.utils import AttributeDict
 from sqlmesh.utils.jinja import (
     ENVIRONMENT,
@@ -329,3 +332,28 @@ def test_macro_registry_to_expressions_sorted():
         == "refs = {'orders': {'database': 'jaffle_shop', 'nested_list': ['a', 'b', 'c'], 'schema': 'main'}, 'payments': {'database': 'jaffle_shop', 'nested': {'baz': 'bing', 'foo': 'bar'}, 'schema': 'main'}}\n"
         "sources = {}"
     )
+
+
+def test_macro_extractor_skips_files_without_blocks(mocker):
+    tokenize = mocker.spy(Tokenizer, "tokenize")
+    extractor = MacroExtractor()
+
+    assert extractor.extract("SELECT '{{ not_a_macro }}' AS col", dialect="duckdb") == {}
+    tokenize.assert_not_called()
+
+    assert list(extractor.extract("{% macro foo() %}1{% endmacro %}", dialect="duckdb")) == ["foo"]
+    tokenize.assert_called_once()
+
+
+def test_macro_extractor_reuses_tokenizer(mocker):
+    tokenizer = mocker.spy(Dialect, "tokenizer")
+    extractor = MacroExtractor()
+
+    assert list(extractor.extract("{% macro foo() %}1{% endmacro %}", dialect="duckdb")) == ["foo"]
+    assert list(extractor.extract("{% macro bar() %}2{% endmacro %}", dialect="duckdb")) == ["bar"]
+    tokenizer.assert_called_once()
+
+    assert list(extractor.extract("{% macro baz() %}3{% endmacro %}", dialect="bigquery")) == [
+        "baz"
+    ]
+    assert tokenizer.call_count == 2